@@ -0,0 +1,137 @@
+"""On-disk cache of fetched wiki pages."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+
+@dataclass
+class CachedPage:
+    """Cached page body with the validators needed for conditional requests."""
+
+    url: str
+    html: bytes
+    fetched_at: float
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+
+
+class HtmlCache:
+    """
+    Stores fetched HTML on disk, one file per URL.
+
+    Each file holds a one-line JSON header with the URL, fetch time and
+    validators, followed by the raw response body, so a hit hands the parser
+    the original bytes without decoding or unescaping them.
+    """
+
+    def __init__(self, cache_dir: Path, expire_after: float) -> None:
+        """
+        Create a cache rooted at cache_dir.
+
+        Args:
+            cache_dir: Directory holding cached pages.
+            expire_after: Seconds a cached page is served without revalidation.
+
+        Returns:
+            None
+
+        Raises:
+            ValueError: If cache_dir is an existing file or expire_after is negative.
+        """
+        if cache_dir.exists() and not cache_dir.is_dir():
+            raise ValueError(f"Cache path is not a directory: {cache_dir}")
+        if expire_after < 0:
+            raise ValueError("expire_after must be non-negative.")
+
+        self.cache_dir = cache_dir
+        self.expire_after = expire_after
+
+    def _path_for(self, url: str) -> Path:
+        digest = hashlib.sha1(url.encode("utf-8")).hexdigest()
+        return self.cache_dir / f"{digest}.page"
+
+    def load(self, url: str) -> Optional[CachedPage]:
+        """
+        Load a cached page.
+
+        Args:
+            url: Page URL.
+
+        Returns:
+            Cached page if present and readable.
+
+        Raises:
+            None
+        """
+        try:
+            with open(self._path_for(url), "rb") as handle:
+                header = json.loads(handle.readline())
+                html = handle.read()
+            page = CachedPage(html=html, **header)
+        except (OSError, ValueError, TypeError):
+            return None
+
+        if page.url != url:
+            return None
+        return page
+
+    def is_fresh(self, page: CachedPage) -> bool:
+        """
+        Check whether a cached page can be used without revalidation.
+
+        Args:
+            page: Cached page.
+
+        Returns:
+            True if the page is younger than the expiry window.
+
+        Raises:
+            None
+        """
+        return time.time() - page.fetched_at < self.expire_after
+
+    def store(
+        self,
+        url: str,
+        html: bytes,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+    ) -> None:
+        """
+        Store a fetched page, replacing any previous entry.
+
+        Args:
+            url: Page URL.
+            html: Raw page body.
+            etag: ETag response header, if any.
+            last_modified: Last-Modified response header, if any.
+
+        Returns:
+            None
+
+        Raises:
+            OSError: If the cache directory or entry cannot be written.
+        """
+        header = {
+            "url": url,
+            "fetched_at": time.time(),
+            "etag": etag,
+            "last_modified": last_modified,
+        }
+        path = self._path_for(url)
+        tmp_path = path.with_suffix(".tmp")
+
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        with open(tmp_path, "wb") as handle:
+            # ASCII-escaped JSON never contains a raw newline, so the header
+            # always ends at the first one.
+            handle.write(json.dumps(header).encode("ascii") + b"\n")
+            handle.write(html)
+        os.replace(tmp_path, path)
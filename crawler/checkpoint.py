@@ -0,0 +1,179 @@
+"""Append-only crawl progress log for resuming interrupted crawls."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+from pathlib import Path
+from typing import Any, Dict
+
+import models
+import parsing
+import utils
+from config import LOGGER_NAME
+from io_utils import dumps_jsonl_line
+from models import RawResearchRecord, ResearchScienceCost, ResearchSciencePack
+
+logger = logging.getLogger(LOGGER_NAME)
+
+
+def parser_fingerprint() -> str:
+    """
+    Hash the sources that determine what a parsed record contains.
+
+    Args:
+        None
+
+    Returns:
+        Hex digest over the parsing, utils and models modules.
+
+    Raises:
+        OSError: If a module source cannot be read.
+    """
+    digest = hashlib.sha1()
+    for module in (parsing, utils, models):
+        digest.update(Path(module.__file__).read_bytes())
+    return digest.hexdigest()
+
+
+# Records saved by a different parser are stale, so the progress file starts
+# with this fingerprint and is discarded when it no longer matches.
+PARSER_FINGERPRINT = parser_fingerprint()
+
+
+def raw_record_from_dict(data: Dict[str, Any]) -> RawResearchRecord:
+    """
+    Rebuild a raw record from its JSON representation.
+
+    Args:
+        data: Decoded JSON object of a serialized RawResearchRecord.
+
+    Returns:
+        Reconstructed raw record.
+
+    Raises:
+        KeyError: If a required field is missing.
+        TypeError: If a field has an unexpected shape.
+    """
+    science = data["research_science"]
+    if science is not None:
+        packs = [ResearchSciencePack(**pack) for pack in science.pop("science_packs")]
+        science = ResearchScienceCost(**science, science_packs=packs)
+
+    return RawResearchRecord(
+        id=data["id"],
+        title=data["title"],
+        internal_name=data["internal_name"],
+        url=data["url"],
+        allows_links_raw=[(url, title) for url, title in data["allows_links_raw"]],
+        required_links_raw=[(url, title) for url, title in data["required_links_raw"]],
+        is_space_age_exclusive=data["is_space_age_exclusive"],
+        selected_variant=data["selected_variant"],
+        research_type=data["research_type"],
+        research_science=science,
+        research_condition_text=data["research_condition_text"],
+        error=data.get("error"),
+    )
+
+
+class CrawlCheckpoint:
+    """Records parsed pages as JSONL so a later run can skip refetching them."""
+
+    def __init__(self, path: Path) -> None:
+        """
+        Create a checkpoint backed by path.
+
+        Args:
+            path: Progress file location.
+
+        Returns:
+            None
+
+        Raises:
+            ValueError: If path is an existing directory.
+        """
+        if path.exists() and path.is_dir():
+            raise ValueError(f"Checkpoint path is a directory: {path}")
+
+        self.path = path
+
+    def load(self) -> Dict[str, RawResearchRecord]:
+        """
+        Load every record saved by previous runs.
+
+        A file written by a different parser version is discarded as a
+        whole. Lines that cannot be decoded, such as one cut short by an
+        interrupt, are skipped; those pages are simply fetched again.
+
+        Args:
+            None
+
+        Returns:
+            Mapping of URL to saved raw record.
+
+        Raises:
+            None
+        """
+        records_by_url: Dict[str, RawResearchRecord] = {}
+        try:
+            handle = open(self.path, "rb")
+        except FileNotFoundError:
+            return records_by_url
+
+        with handle:
+            try:
+                fingerprint = json.loads(handle.readline()).get("parser")
+            except (ValueError, AttributeError):
+                fingerprint = None
+
+            if fingerprint == PARSER_FINGERPRINT:
+                for line in handle:
+                    try:
+                        rec = raw_record_from_dict(json.loads(line))
+                    except (ValueError, KeyError, TypeError, AttributeError):
+                        continue
+                    records_by_url[rec.url] = rec
+
+        if fingerprint != PARSER_FINGERPRINT:
+            logger.info("[RESUME] Discarding %s: saved by a different parser", self.path)
+            self.clear()
+        return records_by_url
+
+    def append(self, rec: RawResearchRecord) -> None:
+        """
+        Append one parsed record to the progress file.
+
+        A new file starts with the parser fingerprint line. The file is
+        reopened per record so each line reaches the OS as soon as it is
+        written and no handle outlives a cancelled crawl.
+
+        Args:
+            rec: Successfully parsed raw record.
+
+        Returns:
+            None
+
+        Raises:
+            OSError: If the progress file cannot be written.
+        """
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "ab") as handle:
+            if handle.tell() == 0:
+                handle.write(dumps_jsonl_line({"parser": PARSER_FINGERPRINT}))
+            handle.write(dumps_jsonl_line(rec))
+
+    def clear(self) -> None:
+        """
+        Discard all saved progress.
+
+        Args:
+            None
+
+        Returns:
+            None
+
+        Raises:
+            None
+        """
+        self.path.unlink(missing_ok=True)
@@ -7,6 +7,13 @@ ROOTS = [
 ]
 
 DEFAULT_OUTPUT_JSONL = "./data/tech_tree.jsonl"
+DEFAULT_CONCURRENCY = 8
+DEFAULT_RATE = 5.0
+DEFAULT_CACHE_DIR = "./.cache/html"
+DEFAULT_PROGRESS_PATH = "./.cache/progress.jsonl"
+CACHE_EXPIRE_SECONDS = 24 * 60 * 60
+LOGGER_NAME = "crawler"
+LOG_BUFFER_RECORDS = 64
 USER_AGENT = (
     "Mozilla/5.0 (compatible; FactorioTechTreeScraper/1.1; "
     "+https://wiki.factorio.com/)"
@@ -2,71 +2,148 @@
 
 from __future__ import annotations
 
-import sys
-import time
-from collections import deque
-from typing import Deque, Dict, Iterable, List, Set
-
-import requests
-
-from http_client import fetch_html
+import asyncio
+import logging
+import multiprocessing
+import os
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain
+from typing import Dict, Iterable, List, Optional, Set
+
+import aiohttp
+
+from cache import HtmlCache
+from checkpoint import CrawlCheckpoint
+from config import DEFAULT_CONCURRENCY, DEFAULT_RATE, LOGGER_NAME
+from http_client import RateLimiter, fetch_html, make_session
 from models import RawResearchRecord, TechRecord
 from parsing import parse_research_page
 from utils import fallback_name_from_title, normalize_research_url
 
+logger = logging.getLogger(LOGGER_NAME)
+
+INVALID_INTERNAL_NAMES = frozenset({"Allows", "Required technologies", "Effects", "Prototype type"})
+
 
 def crawl_research_graph(
-    session: requests.Session,
     roots: Iterable[str],
-    sleep_seconds: float = 0.5,
-    verbose: bool = True,
+    rate: float = DEFAULT_RATE,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    cache: Optional[HtmlCache] = None,
+    checkpoint: Optional[CrawlCheckpoint] = None,
+) -> Dict[str, RawResearchRecord]:
+    """
+    Crawl all reachable research pages from synchronous code.
+
+    Args:
+        roots: Iterable of root research URLs.
+        rate: Maximum number of requests started per second.
+        concurrency: Maximum number of in-flight requests.
+        cache: Optional on-disk page cache.
+        checkpoint: Optional progress log to resume from and append to.
+
+    Returns:
+        Mapping of URL to parsed raw record.
+
+    Raises:
+        ValueError: If no roots are provided or an argument is out of range.
+        RuntimeError: If session creation fails.
+    """
+
+    async def run() -> Dict[str, RawResearchRecord]:
+        async with make_session(concurrency) as session:
+            return await crawl_research_graph_async(
+                session=session,
+                roots=roots,
+                rate=rate,
+                concurrency=concurrency,
+                cache=cache,
+                checkpoint=checkpoint,
+            )
+
+    return asyncio.run(run())
+
+
+async def crawl_research_graph_async(
+    session: aiohttp.ClientSession,
+    roots: Iterable[str],
+    rate: float = DEFAULT_RATE,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    cache: Optional[HtmlCache] = None,
+    checkpoint: Optional[CrawlCheckpoint] = None,
 ) -> Dict[str, RawResearchRecord]:
     """
     Crawl all reachable research pages and parse their content.
 
+    Pages are fetched by a pool of concurrency worker tasks draining a shared
+    queue; each worker handles one page at a time, so the pool size bounds the
+    number of in-flight requests, a token bucket caps the request rate, and
+    parsing is dispatched to a process pool so it neither
+    stalls the event loop nor serializes on the GIL. With a checkpoint, pages
+    saved by an earlier run are reused and only their unfetched links are
+    queued.
+
     Args:
-        session: Requests session to use for fetching.
+        session: aiohttp session to use for fetching.
         roots: Iterable of root research URLs.
-        sleep_seconds: Delay between page fetches.
-        verbose: Whether to log progress to stderr.
+        rate: Maximum number of requests started per second.
+        concurrency: Maximum number of in-flight requests.
+        cache: Optional on-disk page cache.
+        checkpoint: Optional progress log to resume from and append to.
 
     Returns:
         Mapping of URL to parsed raw record.
 
     Raises:
-        ValueError: If no roots are provided or sleep_seconds is negative.
+        ValueError: If no roots are provided or an argument is out of range.
     """
-    if sleep_seconds < 0:
-        raise ValueError("sleep_seconds must be non-negative.")
+    if rate <= 0:
+        raise ValueError("rate must be positive.")
+    if concurrency < 1:
+        raise ValueError("concurrency must be at least 1.")
 
     root_list = [normalize_research_url(root) for root in roots]
     if not root_list:
         raise ValueError("At least one root URL is required.")
 
-    visited: Set[str] = set()
-    queue: Deque[str] = deque(root_list)
     records_by_url: Dict[str, RawResearchRecord] = {}
-
-    while queue:
-        url = queue.popleft()
-        if url in visited:
-            continue
-        visited.add(url)
-
-        if verbose:
-            print(f"[FETCH] {url}", file=sys.stderr)
+    if checkpoint is not None:
+        records_by_url.update(checkpoint.load())
+        if records_by_url:
+            logger.info("[RESUME] Loaded %d pages from %s", len(records_by_url), checkpoint.path)
+
+    # URLs are marked when enqueued, so the queue never holds duplicates.
+    marked: Set[str] = set(records_by_url)
+    queue: asyncio.Queue[str] = asyncio.Queue()
+    resumed_links = (
+        child_url for rec in records_by_url.values() for child_url, _ in rec.allows_links_raw
+    )
+    for url in chain(root_list, resumed_links):
+        if url not in marked:
+            marked.add(url)
+            queue.put_nowait(url)
+    limiter = RateLimiter(max_rate=rate)
+
+    async def crawl_page(url: str) -> None:
+        logger.info("[FETCH] %s", url)
 
         try:
-            html = fetch_html(session, url)
-            rec = parse_research_page(html, url)
+            html = await fetch_html(session, url, limiter, cache)
+            rec = await loop.run_in_executor(parse_pool, parse_research_page, html, url)
             records_by_url[url] = rec
+            if checkpoint is not None:
+                try:
+                    checkpoint.append(rec)
+                except OSError as exc:
+                    logger.warning("[WARN] Could not save progress for %s: %s", url, exc)
 
             for child_url, _ in rec.allows_links_raw:
-                if child_url not in visited:
-                    queue.append(child_url)
+                if child_url not in marked:
+                    marked.add(child_url)
+                    queue.put_nowait(child_url)
         except Exception as exc:
-            if verbose:
-                print(f"[ERROR] Failed to parse {url}: {exc}", file=sys.stderr)
+            logger.warning("[ERROR] Failed to parse %s: %s", url, exc)
 
             fallback = fallback_name_from_title(None, url)
             records_by_url[url] = RawResearchRecord(
@@ -84,7 +161,30 @@ def crawl_research_graph(
                 error=str(exc),
             )
 
-        time.sleep(sleep_seconds)
+    async def worker() -> None:
+        while True:
+            url = await queue.get()
+            try:
+                await crawl_page(url)
+            finally:
+                queue.task_done()
+
+    loop = asyncio.get_running_loop()
+    # At most one parse per worker task is ever pending, so more processes
+    # than that would sit idle. Spawned rather than forked: by the first
+    # submit aiohttp's resolver has started a thread in this process.
+    parse_pool = ProcessPoolExecutor(
+        max_workers=min(concurrency, os.cpu_count() or 1),
+        mp_context=multiprocessing.get_context("spawn"),
+    )
+    with parse_pool:
+        workers = [asyncio.create_task(worker()) for _ in range(concurrency)]
+        try:
+            await queue.join()
+        finally:
+            for task in workers:
+                task.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
 
     return records_by_url
 
@@ -95,43 +195,51 @@ def convert_edges_to_internal_names(
     """
     Convert URL-based edges to internal name references.
 
+    Records are emitted in internal-name order. Crawl completion order varies
+    between runs, so this is the single place the graph is sorted; everything
+    downstream iterates the mapping as-is.
+
     Args:
         records_by_url: Mapping of URL to raw records.
 
     Returns:
-        Mapping of internal name to normalized record.
+        Mapping of internal name to normalized record, ordered by internal name.
 
     Raises:
         ValueError: If an invalid internal name is detected.
     """
-    url_to_internal: Dict[str, str] = {}
-    invalid_names = {"Allows", "Required technologies", "Effects", "Prototype type"}
+    records_by_id: Dict[str, TechRecord] = {}
 
-    for url, rec in records_by_url.items():
-        internal = rec.internal_name
-        if internal in invalid_names:
-            raise ValueError(
-                f"Parsed invalid internal name {internal!r} for page {url}. "
-                "The internal-name parser likely matched an infobox label."
-            )
-        url_to_internal[url] = internal
+    def resolve_id(link_url: str, link_title: Optional[str]) -> str:
+        # Linked records already carry their internal name, so edges resolve
+        # straight through records_by_url and share the target's ID string.
+        linked = records_by_url.get(link_url)
+        return (linked.internal_name if linked else None) or fallback_name_from_title(
+            link_title, link_url
+        )
 
-    records_by_id: Dict[str, TechRecord] = {}
+    ordered = sorted(records_by_url.items(), key=lambda item: (item[1].internal_name, item[0]))
 
-    for url, rec in records_by_url.items():
+    for url, rec in ordered:
         node_id = rec.internal_name
+        if node_id in INVALID_INTERNAL_NAMES:
+            raise ValueError(
+                f"Parsed invalid internal name {node_id!r} for page {url}. "
+                "The internal-name parser likely matched an infobox label."
+            )
 
-        allows_ids: List[str] = []
-        for child_url, child_title in rec.allows_links_raw:
-            child_id = url_to_internal.get(child_url) or fallback_name_from_title(child_title, child_url)
-            if child_id not in allows_ids:
-                allows_ids.append(child_id)
-
-        required_ids: List[str] = []
-        for parent_url, parent_title in rec.required_links_raw:
-            parent_id = url_to_internal.get(parent_url) or fallback_name_from_title(parent_title, parent_url)
-            if parent_id not in required_ids:
-                required_ids.append(parent_id)
+        allows_ids: List[str] = list(
+            dict.fromkeys(
+                resolve_id(child_url, child_title)
+                for child_url, child_title in rec.allows_links_raw
+            )
+        )
+        required_ids: List[str] = list(
+            dict.fromkeys(
+                resolve_id(parent_url, parent_title)
+                for parent_url, parent_title in rec.required_links_raw
+            )
+        )
 
         out = TechRecord(
             id=node_id,
@@ -166,21 +274,21 @@ def invert_edges(records_by_id: Dict[str, TechRecord]) -> None:
     Raises:
         None
     """
-    unlocked_by: Dict[str, List[str]] = {node_id: [] for node_id in records_by_id.keys()}
+    # Invert over dense integer indices rather than re-hashing ID strings.
+    node_ids = list(records_by_id)
+    index_by_id = {node_id: index for index, node_id in enumerate(node_ids)}
+    unlocked_by: List[array] = [array("I") for _ in node_ids]
 
-    for parent_id, rec in records_by_id.items():
+    for parent_index, rec in enumerate(records_by_id.values()):
         for child_id in rec.allows:
-            if child_id in unlocked_by:
-                unlocked_by[child_id].append(parent_id)
+            child_index = index_by_id.get(child_id)
+            if child_index is not None:
+                unlocked_by[child_index].append(parent_index)
 
-    for node_id, rec in records_by_id.items():
-        explicit = list(dict.fromkeys(rec.required_technologies))
-        derived = list(dict.fromkeys(unlocked_by.get(node_id, [])))
+    for node_index, rec in enumerate(records_by_id.values()):
+        derived = [node_ids[index] for index in dict.fromkeys(unlocked_by[node_index])]
 
         rec.unlocked_by_derived = derived
-
-        merged = explicit[:]
-        for parent in derived:
-            if parent not in merged:
-                merged.append(parent)
-        rec.required_technologies_merged = merged
+        rec.required_technologies_merged = list(
+            dict.fromkeys(chain(rec.required_technologies, derived))
+        )
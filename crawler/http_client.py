@@ -2,52 +2,217 @@
 
 from __future__ import annotations
 
-import requests
+import asyncio
+import logging
+import random
+import time
+from typing import Dict, Optional
 
-from config import USER_AGENT
+import aiohttp
 
+from cache import HtmlCache
+from config import LOGGER_NAME, USER_AGENT
 
-def make_session() -> requests.Session:
+logger = logging.getLogger(LOGGER_NAME)
+
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+class RateLimiter:
+    """Token-bucket limiter capping how many requests start per time period.
+
+    Implemented as a single wall-clock schedule: each acquisition reserves the
+    next start time and sleeps once until it, so waiters never poll or queue
+    on a lock, and time already spent elsewhere counts toward the interval.
     """
-    Create a requests session with default headers.
+
+    def __init__(self, max_rate: float, time_period: float = 1.0) -> None:
+        """
+        Create a limiter allowing max_rate acquisitions per time_period.
+
+        Args:
+            max_rate: Number of acquisitions allowed per period.
+            time_period: Period length in seconds.
+
+        Returns:
+            None
+
+        Raises:
+            ValueError: If max_rate or time_period is not positive.
+        """
+        if max_rate <= 0:
+            raise ValueError("max_rate must be positive.")
+        if time_period <= 0:
+            raise ValueError("time_period must be positive.")
+
+        self._interval = time_period / max_rate
+        self._burst = (max(1.0, max_rate) - 1) * self._interval
+        self._next_slot = time.monotonic() - self._burst
+
+    async def acquire(self) -> None:
+        """
+        Reserve the next request slot and wait until it starts.
+
+        Args:
+            None
+
+        Returns:
+            None
+
+        Raises:
+            None
+        """
+        now = time.monotonic()
+        slot = max(self._next_slot, now - self._burst)
+        self._next_slot = slot + self._interval
+
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+
+def make_session(concurrency: int) -> aiohttp.ClientSession:
+    """
+    Create an aiohttp session with default headers and a bounded connection pool.
+
+    Must be called from within a running event loop.
 
     Args:
-        None
+        concurrency: Maximum number of simultaneous connections.
 
     Returns:
-        Configured requests session.
+        Configured aiohttp client session.
 
     Raises:
+        ValueError: If concurrency is not positive.
         RuntimeError: If the session cannot be created.
     """
+    if concurrency < 1:
+        raise ValueError("concurrency must be at least 1.")
+
     try:
-        session = requests.Session()
-    except requests.RequestException as exc:
+        connector = aiohttp.TCPConnector(limit=concurrency, keepalive_timeout=30)
+        session = aiohttp.ClientSession(
+            headers={"User-Agent": USER_AGENT},
+            connector=connector,
+        )
+    except aiohttp.ClientError as exc:
         raise RuntimeError(f"Failed to create session: {exc}") from exc
 
-    session.headers.update({"User-Agent": USER_AGENT})
     return session
 
 
-def fetch_html(session: requests.Session, url: str, timeout: float = 20.0) -> str:
+def store_page(
+    cache: HtmlCache,
+    url: str,
+    html: bytes,
+    etag: Optional[str] = None,
+    last_modified: Optional[str] = None,
+) -> None:
+    """
+    Store a fetched page in the cache, logging rather than raising on failure.
+
+    The cache is only an optimisation; a page that downloaded fine must not
+    be reported as failed because it could not be written to disk.
+
+    Args:
+        cache: On-disk page cache.
+        url: Page URL.
+        html: Raw page body.
+        etag: ETag response header, if any.
+        last_modified: Last-Modified response header, if any.
+
+    Returns:
+        None
+
+    Raises:
+        None
     """
-    Fetch HTML content from a URL.
+    try:
+        cache.store(url, html, etag=etag, last_modified=last_modified)
+    except OSError as exc:
+        logger.warning("[WARN] Could not cache %s: %s", url, exc)
+
+
+async def fetch_html(
+    session: aiohttp.ClientSession,
+    url: str,
+    limiter: RateLimiter,
+    cache: Optional[HtmlCache] = None,
+    timeout: float = 20.0,
+    max_retries: int = 4,
+) -> bytes:
+    """
+    Fetch HTML content from a URL, retrying transient failures with backoff.
+
+    Rate-limit and server-error responses as well as dropped connections
+    (e.g. a keep-alive socket closed by the server) are retried with
+    exponential backoff plus jitter. When a cache is given, fresh entries are
+    served without a request and stale ones are revalidated with a
+    conditional GET.
 
     Args:
-        session: Requests session to use.
+        session: aiohttp session to use.
         url: Page URL.
+        limiter: Rate limiter acquired before every request attempt.
+        cache: Optional on-disk page cache.
         timeout: Request timeout in seconds.
+        max_retries: Number of retries after a transient failure.
 
     Returns:
-        Response HTML as text.
+        Raw response body, undecoded.
 
     Raises:
         RuntimeError: If the request fails.
     """
+    cached = cache.load(url) if cache is not None else None
+    if cached is not None and cache.is_fresh(cached):
+        return cached.html
+
+    headers: Dict[str, str] = {}
+    if cached is not None:
+        if cached.etag:
+            headers["If-None-Match"] = cached.etag
+        if cached.last_modified:
+            headers["If-Modified-Since"] = cached.last_modified
+
+    client_timeout = aiohttp.ClientTimeout(total=timeout)
+
     try:
-        resp = session.get(url, timeout=timeout)
-        resp.raise_for_status()
-    except requests.RequestException as exc:
+        for attempt in range(max_retries + 1):
+            if attempt:
+                await asyncio.sleep(2 ** (attempt - 1) + random.random())
+
+            await limiter.acquire()
+            try:
+                async with session.get(url, headers=headers, timeout=client_timeout) as resp:
+                    if resp.status in RETRY_STATUSES and attempt < max_retries:
+                        continue
+
+                    if cache is not None and cached is not None and resp.status == 304:
+                        store_page(
+                            cache,
+                            url,
+                            cached.html,
+                            etag=resp.headers.get("ETag", cached.etag),
+                            last_modified=resp.headers.get("Last-Modified", cached.last_modified),
+                        )
+                        return cached.html
+
+                    resp.raise_for_status()
+                    html = await resp.read()
+                    if cache is not None:
+                        store_page(
+                            cache,
+                            url,
+                            html,
+                            etag=resp.headers.get("ETag"),
+                            last_modified=resp.headers.get("Last-Modified"),
+                        )
+                    return html
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+                if attempt == max_retries:
+                    raise
+    except (aiohttp.ClientError, asyncio.TimeoutError) as exc:
         raise RuntimeError(f"Failed to fetch {url}: {exc}") from exc
 
-    return resp.text
+    raise RuntimeError(f"Failed to fetch {url}: retries exhausted.")
@@ -3,16 +3,79 @@
 from __future__ import annotations
 
 import json
+import os
+from dataclasses import fields, is_dataclass
 from pathlib import Path
-from typing import Dict
+from typing import Any, Dict
 
 from models import TechRecord
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+WRITE_BUFFER_BYTES = 1024 * 1024
+
+
+def dataclass_fields_dict(obj: Any) -> Dict[str, Any]:
+    """
+    Convert a dataclass instance to a dict for the stdlib JSON encoder.
+
+    Used as the encoder's default hook, so nested dataclasses are converted
+    as they are reached. Unlike dataclasses.asdict, field values are not
+    deep-copied.
+
+    Args:
+        obj: Object the encoder could not serialize.
+
+    Returns:
+        Mapping of field name to field value.
+
+    Raises:
+        TypeError: If obj is not a dataclass instance.
+    """
+    if is_dataclass(obj) and not isinstance(obj, type):
+        return {f.name: getattr(obj, f.name) for f in fields(obj)}
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def dumps_jsonl_line(record: Any) -> bytes:
+    """
+    Serialize a record as one UTF-8 encoded JSONL line.
+
+    Uses orjson when installed, which encodes dataclass records natively
+    without building an intermediate dict, and falls back to the standard
+    library with matching compact separators otherwise.
+
+    Args:
+        record: Dataclass instance or JSON-serializable dictionary.
+
+    Returns:
+        Encoded JSON followed by a newline.
+
+    Raises:
+        TypeError: If the record is not JSON-serializable.
+    """
+    if orjson is not None:
+        return orjson.dumps(record, option=orjson.OPT_APPEND_NEWLINE)
+
+    line = json.dumps(
+        record,
+        ensure_ascii=False,
+        separators=(",", ":"),
+        default=dataclass_fields_dict,
+    )
+    return line.encode("utf-8") + b"\n"
+
 
 def write_jsonl(records_by_id: Dict[str, TechRecord], output_path: Path) -> None:
     """
     Write normalized research records to a JSONL file.
 
+    Records are written in mapping order, which convert_edges_to_internal_names
+    already sorts by internal name. The file is replaced atomically.
+
     Args:
         records_by_id: Mapping of internal name to normalized record.
         output_path: Output file path.
@@ -28,7 +91,14 @@ def write_jsonl(records_by_id: Dict[str, TechRecord], output_path: Path) -> None
 
     output_path.parent.mkdir(parents=True, exist_ok=True)
 
-    with open(output_path, "w", encoding="utf-8") as handle:
-        for node_id in sorted(records_by_id.keys()):
-            record = records_by_id[node_id].to_dict()
-            handle.write(json.dumps(record, ensure_ascii=False) + "\n")
+    # Write beside the target and swap it in, so an interrupted run never
+    # leaves a truncated file behind. No fsync: durability across a power
+    # loss is not worth the stall for a regenerable export.
+    tmp_path = output_path.with_suffix(output_path.suffix + ".tmp")
+    try:
+        with open(tmp_path, "wb", buffering=WRITE_BUFFER_BYTES) as handle:
+            handle.writelines(dumps_jsonl_line(record) for record in records_by_id.values())
+        os.replace(tmp_path, output_path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
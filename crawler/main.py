@@ -5,16 +5,29 @@ Crawl Factorio research pages and export a JSONL tech tree.
 from __future__ import annotations
 
 import argparse
+import logging
 import sys
+from logging.handlers import MemoryHandler
 from pathlib import Path
 
-from config import DEFAULT_OUTPUT_JSONL, ROOTS
+from cache import HtmlCache
+from checkpoint import CrawlCheckpoint
+from config import (
+    CACHE_EXPIRE_SECONDS,
+    DEFAULT_CACHE_DIR,
+    DEFAULT_CONCURRENCY,
+    DEFAULT_OUTPUT_JSONL,
+    DEFAULT_PROGRESS_PATH,
+    DEFAULT_RATE,
+    LOG_BUFFER_RECORDS,
+    LOGGER_NAME,
+    ROOTS,
+)
 from crawl import (
     convert_edges_to_internal_names,
     crawl_research_graph,
     invert_edges,
 )
-from http_client import make_session
 from io_utils import write_jsonl
 
 
@@ -42,11 +55,33 @@ def parse_args() -> argparse.Namespace:
         default=DEFAULT_OUTPUT_JSONL,
         help=f"Path to output JSONL file (default: {DEFAULT_OUTPUT_JSONL})",
     )
+    parser.add_argument(
+        "--rate",
+        type=float,
+        default=DEFAULT_RATE,
+        help=f"Maximum page requests per second (default: {DEFAULT_RATE})",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=DEFAULT_CONCURRENCY,
+        help=f"Maximum number of in-flight page requests (default: {DEFAULT_CONCURRENCY})",
+    )
     parser.add_argument(
         "--sleep",
         type=float,
-        default=0.1,
-        help="Delay in seconds between page fetches (default: 0.5)",
+        default=None,
+        help="Deprecated and ignored; use --rate instead",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help=f"Always fetch pages from the wiki instead of the on-disk cache in {DEFAULT_CACHE_DIR}",
+    )
+    parser.add_argument(
+        "--no-resume",
+        action="store_true",
+        help=f"Discard saved progress in {DEFAULT_PROGRESS_PATH} and crawl from the roots",
     )
     parser.add_argument(
         "--quiet",
@@ -69,8 +104,10 @@ def validate_args(args: argparse.Namespace) -> None:
     Raises:
         ValueError: If any argument is invalid.
     """
-    if args.sleep < 0:
-        raise ValueError("--sleep must be non-negative.")
+    if args.rate <= 0:
+        raise ValueError("--rate must be positive.")
+    if args.concurrency < 1:
+        raise ValueError("--concurrency must be at least 1.")
     if not args.output_jsonl:
         raise ValueError("--output-jsonl must not be empty.")
 
@@ -79,6 +116,37 @@ def validate_args(args: argparse.Namespace) -> None:
         raise ValueError(f"Output path is a directory: {output_path}")
 
 
+def configure_logging(verbose: bool) -> MemoryHandler:
+    """
+    Route crawler logs to stderr through a buffering handler.
+
+    Progress lines are batched and written LOG_BUFFER_RECORDS at a time;
+    warnings flush the buffer immediately so failures are not delayed.
+
+    Args:
+        verbose: Whether progress logs should be emitted.
+
+    Returns:
+        The installed buffering handler, to be closed when the run ends.
+
+    Raises:
+        None
+    """
+    stream_handler = logging.StreamHandler(sys.stderr)
+    stream_handler.setFormatter(logging.Formatter("%(message)s"))
+    buffer_handler = MemoryHandler(
+        LOG_BUFFER_RECORDS,
+        flushLevel=logging.WARNING,
+        target=stream_handler,
+    )
+
+    logger = logging.getLogger(LOGGER_NAME)
+    logger.addHandler(buffer_handler)
+    logger.setLevel(logging.INFO if verbose else logging.CRITICAL)
+    logger.propagate = False
+    return buffer_handler
+
+
 def run(args: argparse.Namespace) -> int:
     """
     Execute the crawler workflow from parsed arguments.
@@ -94,24 +162,60 @@ def run(args: argparse.Namespace) -> int:
         RuntimeError: If session creation fails.
     """
     validate_args(args)
-    verbose = not args.quiet
+    log_handler = configure_logging(verbose=not args.quiet)
+    try:
+        return crawl_and_write(args)
+    finally:
+        logging.getLogger(LOGGER_NAME).removeHandler(log_handler)
+        log_handler.close()
+
+
+def crawl_and_write(args: argparse.Namespace) -> int:
+    """
+    Crawl the tech tree and write it to the configured output.
+
+    Args:
+        args: Validated CLI arguments.
+
+    Returns:
+        Exit code for the process.
+
+    Raises:
+        ValueError: If the cache directory, checkpoint, or output path is invalid.
+        RuntimeError: If session creation fails.
+    """
+    logger = logging.getLogger(LOGGER_NAME)
+
+    if args.sleep is not None:
+        logger.warning("[WARN] --sleep is deprecated and ignored; use --rate instead.")
+
+    cache = None
+    if not args.no_cache:
+        cache = HtmlCache(Path(DEFAULT_CACHE_DIR), expire_after=CACHE_EXPIRE_SECONDS)
 
-    session = make_session()
+    checkpoint = CrawlCheckpoint(Path(DEFAULT_PROGRESS_PATH))
+    if args.no_resume:
+        checkpoint.clear()
 
     records_by_url = crawl_research_graph(
-        session=session,
         roots=ROOTS,
-        sleep_seconds=args.sleep,
-        verbose=verbose,
+        rate=args.rate,
+        concurrency=args.concurrency,
+        cache=cache,
+        checkpoint=checkpoint,
     )
 
     records_by_id = convert_edges_to_internal_names(records_by_url)
+    # Raw records are not needed once edges reference internal names; free
+    # them before inversion and writing so only one copy of the graph is live.
+    del records_by_url
     invert_edges(records_by_id)
 
     write_jsonl(records_by_id, Path(args.output_jsonl))
+    # The export is complete, so the next run should crawl fresh pages.
+    checkpoint.clear()
 
-    if verbose:
-        print(f"[DONE] Wrote {len(records_by_id)} records to {args.output_jsonl}", file=sys.stderr)
+    logger.info("[DONE] Wrote %d records to %s", len(records_by_id), args.output_jsonl)
 
     return 0
 
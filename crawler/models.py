@@ -2,11 +2,11 @@
 
 from __future__ import annotations
 
-from dataclasses import asdict, dataclass, field
-from typing import Any, Dict, List, Optional, Tuple
+from dataclasses import dataclass, field
+from typing import List, Optional, Tuple
 
 
-@dataclass
+@dataclass(slots=True)
 class ResearchSciencePack:
     """Science pack requirement details."""
 
@@ -15,7 +15,7 @@ class ResearchSciencePack:
     amount_text: Optional[str]
 
 
-@dataclass
+@dataclass(slots=True)
 class ResearchScienceCost:
     """Science-based research cost details."""
 
@@ -26,7 +26,7 @@ class ResearchScienceCost:
     science_packs: List[ResearchSciencePack] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(slots=True)
 class RawResearchRecord:
     """Parsed page data keyed by wiki URL."""
 
@@ -44,7 +44,7 @@ class RawResearchRecord:
     error: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class TechRecord:
     """Normalized research record keyed by internal name."""
 
@@ -61,18 +61,3 @@ class TechRecord:
     research_science: Optional[ResearchScienceCost] = None
     research_condition_text: Optional[str] = None
     error: Optional[str] = None
-
-    def to_dict(self) -> Dict[str, Any]:
-        """
-        Convert the record to a JSON-serializable dictionary.
-
-        Args:
-            None
-
-        Returns:
-            Dictionary representation of the record.
-
-        Raises:
-            None
-        """
-        return asdict(self)
@@ -3,164 +3,229 @@
 from __future__ import annotations
 
 import re
-from typing import List, Optional, Set, Tuple, Union
-from urllib.parse import urljoin
+from typing import Dict, Iterator, List, Optional, Tuple, Union
 
-from bs4 import BeautifulSoup, NavigableString, Tag
+import lxml.html
+from lxml import etree
+from lxml.html import HtmlElement
 
-from config import BASE_URL
 from models import RawResearchRecord, ResearchScienceCost, ResearchSciencePack
 from utils import fallback_name_from_title, normalize_research_url
 
-ResearchScope = Union[BeautifulSoup, Tag]
-
-
-def extract_page_title(soup: BeautifulSoup) -> Optional[str]:
-    """
-    Extract the page title from the wiki document.
+# The wiki always serves UTF-8. Pinning the encoding lets the parser decode
+# raw response bytes itself instead of guessing from missing meta tags.
+# Nothing looks elements up by ID, so the parser skips building its ID table.
+HTML_PARSER = lxml.html.HTMLParser(encoding="utf-8", collect_ids=False)
+
+ResearchScope = HtmlElement
+LabelIndex = Dict[str, Optional[HtmlElement]]
+
+NON_TEXT_TAGS = frozenset({"script", "style", "template"})
+WIKI_TITLE_SUFFIX_RE = re.compile(r"\s*-\s*Factorio Wiki\s*$")
+NUMBER_RE = re.compile(r"[-+]?[0-9]*\.?[0-9]+")
+WHITESPACE_RE = re.compile(r"\s+")
+SPACE_AGE_MARKERS = ("Space Age expansion exclusive feature", "Introduced in Space Age")
+SPACE_AGE_MARKER_BYTES = tuple(marker.encode("utf-8") for marker in SPACE_AGE_MARKERS)
+# Research links are site-relative hrefs ending in "_(research)". XPath 1.0
+# has no ends-with(), so the suffix test compares a trailing substring.
+RESEARCH_LINKS = etree.XPath(
+    './/a[starts-with(@href, "/") and '
+    'substring(@href, string-length(@href) - string-length($suffix) + 1) = $suffix]'
+)
+TEXT_NODES = etree.XPath(".//text()")
+FACTORIO_ICONS = etree.XPath(
+    './/div[contains(concat(" ", normalize-space(@class), " "), " factorio-icon ")]'
+)
+# Infobox labels that a misaligned row would yield in place of a real name.
+INTERNAL_NAME_BAD_VALUES = frozenset(
+    {"Allows", "Required technologies", "Effects", "Prototype type", "Researched by", "Cost"}
+)
+INFOBOX_LABELS = frozenset(
+    {"Internal name", "Allows", "Required technologies", "Cost", "Research cost", "Researched by"}
+)
+
+
+def iter_strings(node: HtmlElement) -> Iterator[str]:
+    """
+    Iterate over the text nodes of a subtree in document order.
+
+    Comments and the contents of script, style and template elements are
+    skipped, matching what a reader of the rendered page would see.
 
     Args:
-        soup: Parsed HTML document.
+        node: Root of the subtree.
 
     Returns:
-        Page title if found.
+        Iterator over text node strings.
 
     Raises:
         None
     """
-    h1 = soup.find("h1", id="firstHeading")
-    if h1:
-        return h1.get_text(" ", strip=True)
+    if node.tag in NON_TEXT_TAGS:
+        return
 
-    title_tag = soup.find("title")
-    if title_tag:
-        title = title_tag.get_text(" ", strip=True)
-        return re.sub(r"\s*-\s*Factorio Wiki\s*$", "", title)
+    if node.text:
+        yield node.text
 
-    return None
+    for child in node:
+        # A skipped element's tail is text of its parent, so it is kept.
+        if isinstance(child.tag, str):
+            yield from iter_strings(child)
+        if child.tail:
+            yield child.tail
 
 
-def is_research_link(href: Optional[str]) -> bool:
+def node_text(node: HtmlElement, separator: str = " ") -> str:
     """
-    Determine whether a link points to a research page.
+    Join the stripped, non-empty text nodes of a subtree.
 
     Args:
-        href: Link href string.
+        node: Root of the subtree.
+        separator: String inserted between text nodes.
 
     Returns:
-        True if the link targets a research page.
+        Joined text.
 
     Raises:
         None
     """
-    if not href:
-        return False
-    if not href.startswith("/"):
-        return False
-    return href.endswith("_(research)")
+    return separator.join(text for text in (s.strip() for s in iter_strings(node)) if text)
 
 
-def extract_internal_name(scope: ResearchScope) -> Optional[str]:
+def has_class(node: HtmlElement, class_name: str) -> bool:
     """
-    Extract the internal technology name from the infobox.
+    Check whether an element carries a CSS class.
 
     Args:
-        scope: HTML scope to search.
+        node: Element to inspect.
+        class_name: Class name to look for.
 
     Returns:
-        Internal name if found.
+        True if the class is present.
 
     Raises:
         None
     """
-    label_node = scope.find(string=lambda s: isinstance(s, str) and s.strip() == "Internal name")
-    if label_node is None:
-        return None
+    return class_name in (node.get("class") or "").split()
 
-    label_tr = label_node.find_parent("tr")
-    if label_tr is None:
-        return None
 
-    value_tr = label_tr.find_next_sibling("tr")
-    if value_tr is None:
-        return None
+def extract_page_title(root: HtmlElement) -> Optional[str]:
+    """
+    Extract the page title from the wiki document.
 
-    value_td = value_tr.find("td")
-    if value_td is None:
-        return None
+    Args:
+        root: Parsed HTML document.
 
-    value = value_td.get_text(" ", strip=True)
-    if not value:
-        return None
+    Returns:
+        Page title if found.
 
-    bad_values = {
-        "Allows",
-        "Required technologies",
-        "Effects",
-        "Prototype type",
-        "Researched by",
-        "Cost",
-    }
-    if value in bad_values:
-        return None
+    Raises:
+        None
+    """
+    h1 = root.find('.//h1[@id="firstHeading"]')
+    if h1 is not None:
+        return node_text(h1)
 
-    return value
+    title_tag = root.find(".//title")
+    if title_tag is not None:
+        title = node_text(title_tag)
+        return WIKI_TITLE_SUFFIX_RE.sub("", title)
 
+    return None
 
-def get_preferred_research_scope(soup: BeautifulSoup) -> ResearchScope:
+
+def build_label_index(scope: ResearchScope) -> LabelIndex:
     """
-    Select the HTML scope used for parsing the research page.
+    Map each infobox label to the value cell in the row after it.
+
+    The scope is scanned once for every label in INFOBOX_LABELS. Only the
+    first text node equal to a label counts, so a label whose first match
+    has no value row maps to None.
 
     Args:
-        soup: Parsed HTML document.
+        scope: HTML scope to search.
 
     Returns:
-        HTML scope for parsing.
+        Mapping of label text to its value cell, if any.
 
     Raises:
         None
     """
-    space_age_tab = soup.select_one("table.tab.tab-2")
-    if space_age_tab is not None:
-        return space_age_tab
+    labels: LabelIndex = {}
 
-    base_tab = soup.select_one("table.tab.tab-1")
-    if base_tab is not None:
-        return base_tab
+    for text in TEXT_NODES(scope):
+        label = text.strip()
+        if label not in INFOBOX_LABELS or label in labels:
+            continue
 
-    return soup
+        owner = text.getparent()
+        if text.is_tail:
+            owner = owner.getparent()
+        while owner is not None and owner.tag != "tr":
+            owner = owner.getparent()
 
+        value_tr = next(owner.itersiblings("tr"), None) if owner is not None else None
+        labels[label] = value_tr.find(".//td") if value_tr is not None else None
 
-def find_section_cell_by_label(scope: ResearchScope, label: str) -> Optional[Tag]:
+    return labels
+
+
+def extract_internal_name(labels: LabelIndex) -> Optional[str]:
     """
-    Find a section cell following a label row in the infobox.
+    Extract the internal technology name from the infobox.
 
     Args:
-        scope: HTML scope to search.
-        label: Section label text.
+        labels: Infobox label index for the page.
 
     Returns:
-        The section cell tag if found.
+        Internal name if found.
 
     Raises:
         None
     """
-    label_node = scope.find(string=lambda s: isinstance(s, str) and s.strip() == label)
-    if label_node is None:
+    value_td = labels.get("Internal name")
+    if value_td is None:
         return None
 
-    tr = label_node.find_parent("tr")
-    if tr is None:
+    value = node_text(value_td)
+    if not value:
         return None
 
-    next_tr = tr.find_next_sibling("tr")
-    if next_tr is None:
+    if value in INTERNAL_NAME_BAD_VALUES:
         return None
 
-    return next_tr.find("td")
+    return value
+
+
+def get_preferred_research_scope(root: HtmlElement) -> ResearchScope:
+    """
+    Select the HTML scope used for parsing the research page.
+
+    Args:
+        root: Parsed HTML document.
 
+    Returns:
+        HTML scope for parsing.
 
-def extract_research_links_from_cell(cell: Optional[Tag]) -> List[Tuple[str, str]]:
+    Raises:
+        None
+    """
+    base_tab = None
+    for table in root.iter("table"):
+        if not has_class(table, "tab"):
+            continue
+        if has_class(table, "tab-2"):
+            return table
+        if base_tab is None and has_class(table, "tab-1"):
+            base_tab = table
+
+    if base_tab is not None:
+        return base_tab
+
+    return root
+
+
+def extract_research_links_from_cell(cell: Optional[HtmlElement]) -> List[Tuple[str, str]]:
     """
     Extract research links from a section cell.
 
@@ -176,32 +241,23 @@ def extract_research_links_from_cell(cell: Optional[Tag]) -> List[Tuple[str, str
     if cell is None:
         return []
 
-    out: List[Tuple[str, str]] = []
-    seen: Set[str] = set()
-
-    for anchor in cell.find_all("a", href=True):
-        href = anchor["href"]
-        title = anchor.get("title", "").strip()
-
-        if not is_research_link(href):
-            continue
-
-        full_url = normalize_research_url(urljoin(BASE_URL, href))
-        if full_url in seen:
-            continue
+    # Keyed by URL so the first title seen for a page wins.
+    links: Dict[str, str] = {}
 
-        seen.add(full_url)
-        out.append((full_url, title))
+    for anchor in RESEARCH_LINKS(cell, suffix="_(research)"):
+        full_url = normalize_research_url(anchor.get("href"))
+        if full_url not in links:
+            links[full_url] = anchor.get("title", "").strip()
 
-    return out
+    return list(links.items())
 
 
-def extract_allows_links(scope: ResearchScope) -> List[Tuple[str, str]]:
+def extract_allows_links(labels: LabelIndex) -> List[Tuple[str, str]]:
     """
     Extract links from the Allows section.
 
     Args:
-        scope: HTML scope to search.
+        labels: Infobox label index for the page.
 
     Returns:
         List of (absolute_url, title) tuples.
@@ -209,16 +265,16 @@ def extract_allows_links(scope: ResearchScope) -> List[Tuple[str, str]]:
     Raises:
         None
     """
-    cell = find_section_cell_by_label(scope, "Allows")
+    cell = labels.get("Allows")
     return extract_research_links_from_cell(cell)
 
 
-def extract_required_links(scope: ResearchScope) -> List[Tuple[str, str]]:
+def extract_required_links(labels: LabelIndex) -> List[Tuple[str, str]]:
     """
     Extract links from the Required technologies section.
 
     Args:
-        scope: HTML scope to search.
+        labels: Infobox label index for the page.
 
     Returns:
         List of (absolute_url, title) tuples.
@@ -226,16 +282,22 @@ def extract_required_links(scope: ResearchScope) -> List[Tuple[str, str]]:
     Raises:
         None
     """
-    cell = find_section_cell_by_label(scope, "Required technologies")
+    cell = labels.get("Required technologies")
     return extract_research_links_from_cell(cell)
 
 
-def extract_space_age_flag(soup: BeautifulSoup) -> bool:
+def extract_space_age_flag(root: HtmlElement, html: bytes) -> bool:
     """
     Detect whether a page is Space Age exclusive.
 
+    The raw HTML is checked first: a page whose source lacks both markers
+    cannot contain them as text. Only pages that pass are confirmed against
+    the document text, since the source may also mention a marker inside a
+    script, comment or attribute.
+
     Args:
-        soup: Parsed HTML document.
+        root: Parsed HTML document.
+        html: Raw HTML the document was parsed from.
 
     Returns:
         True if the page is Space Age exclusive.
@@ -243,8 +305,12 @@ def extract_space_age_flag(soup: BeautifulSoup) -> bool:
     Raises:
         None
     """
-    text = soup.get_text("\n", strip=True)
-    return "Space Age expansion exclusive feature" in text or "Introduced in Space Age" in text
+    if not any(marker in html for marker in SPACE_AGE_MARKER_BYTES):
+        return False
+
+    # The markers never span text nodes, so stop at the first node holding
+    # one instead of joining the text of the whole document.
+    return any(marker in text for text in iter_strings(root) for marker in SPACE_AGE_MARKERS)
 
 
 def parse_number(value: str) -> Optional[float]:
@@ -266,7 +332,14 @@ def parse_number(value: str) -> Optional[float]:
     cleaned = value.strip()
     cleaned = cleaned.replace(",", "")
     cleaned = cleaned.replace("\u00d7", " ").replace("\u2716", " ")
-    match = re.search(r"[-+]?[0-9]*\\.?[0-9]+", cleaned)
+
+    # Most values are plain decimals such as "60" or "2.5". float() would
+    # also accept forms the pattern does not ("1e3", "nan", "1_000"), so it
+    # is only trusted when the text is ASCII digits with at most one dot.
+    if cleaned.isascii() and cleaned.replace(".", "", 1).isdigit():
+        return float(cleaned)
+
+    match = NUMBER_RE.search(cleaned)
     if not match:
         return None
 
@@ -289,6 +362,12 @@ def parse_int(value: str) -> Optional[int]:
     Raises:
         None
     """
+    if value:
+        # Unit counts are usually plain integers such as "1,000".
+        digits = value.strip().replace(",", "")
+        if digits.isascii() and digits.isdigit():
+            return int(digits)
+
     parsed = parse_number(value)
     if parsed is None:
         return None
@@ -297,40 +376,53 @@ def parse_int(value: str) -> Optional[int]:
     return None
 
 
-def extract_icon_title(icon: Tag) -> Optional[str]:
+def extract_icon_info(icon: HtmlElement) -> Tuple[Optional[str], Optional[str]]:
     """
-    Extract the title from a Factorio icon element.
+    Extract the title and caption text from a Factorio icon element.
+
+    The title comes from the first anchor with a title attribute, falling
+    back to the first image with alt text; the caption is the text of the
+    first factorio-icon-text div. All three are found in one walk.
 
     Args:
         icon: Icon element tag.
 
     Returns:
-        Title text if available.
+        Tuple of (title, caption text), each None if unavailable.
 
     Raises:
         None
     """
-    anchor = icon.find("a", title=True)
-    if anchor is not None:
-        title = anchor.get("title")
-        if title:
-            return title.strip()
+    anchor_title: Optional[str] = None
+    image_alt: Optional[str] = None
+    caption: Optional[HtmlElement] = None
 
-    image = icon.find("img", alt=True)
-    if image is not None:
-        alt = image.get("alt")
-        if alt:
-            return alt.strip()
+    for node in icon.iterdescendants("a", "img", "div"):
+        if node.tag == "a":
+            if anchor_title is None:
+                anchor_title = node.get("title")
+        elif node.tag == "img":
+            if image_alt is None:
+                image_alt = node.get("alt")
+        elif caption is None and has_class(node, "factorio-icon-text"):
+            caption = node
 
-    return None
+    title = None
+    if anchor_title:
+        title = anchor_title.strip()
+    elif image_alt:
+        title = image_alt.strip()
+
+    caption_text = node_text(caption) if caption is not None else None
+    return title, caption_text
 
 
-def extract_science_cost(scope: ResearchScope) -> Optional[ResearchScienceCost]:
+def extract_science_cost(labels: LabelIndex) -> Optional[ResearchScienceCost]:
     """
     Extract science cost information from the Cost section.
 
     Args:
-        scope: HTML scope to search.
+        labels: Infobox label index for the page.
 
     Returns:
         Parsed science cost if present.
@@ -338,13 +430,13 @@ def extract_science_cost(scope: ResearchScope) -> Optional[ResearchScienceCost]:
     Raises:
         None
     """
-    cell = find_section_cell_by_label(scope, "Cost")
+    cell = labels.get("Cost")
     if cell is None:
-        cell = find_section_cell_by_label(scope, "Research cost")
+        cell = labels.get("Research cost")
     if cell is None:
         return None
 
-    icon_divs = cell.find_all("div", class_="factorio-icon")
+    icon_divs = FACTORIO_ICONS(cell)
     if not icon_divs:
         return None
 
@@ -352,9 +444,8 @@ def extract_science_cost(scope: ResearchScope) -> Optional[ResearchScienceCost]:
     time_text = None
     start_index = 0
 
-    first_title = extract_icon_title(icon_divs[0])
-    first_text = icon_divs[0].find("div", class_="factorio-icon-text")
-    first_text_value = first_text.get_text(" ", strip=True) if first_text else None
+    icons = [extract_icon_info(icon) for icon in icon_divs]
+    first_title, first_text_value = icons[0]
 
     if first_title and first_title.lower() == "time":
         time_text = first_text_value
@@ -362,12 +453,9 @@ def extract_science_cost(scope: ResearchScope) -> Optional[ResearchScienceCost]:
         start_index = 1
 
     science_packs: List[ResearchSciencePack] = []
-    for icon in icon_divs[start_index:]:
-        title = extract_icon_title(icon)
+    for title, amount_text in icons[start_index:]:
         if not title:
             continue
-        amount_node = icon.find("div", class_="factorio-icon-text")
-        amount_text = amount_node.get_text(" ", strip=True) if amount_node else None
         amount_per_unit = parse_number(amount_text or "") if amount_text else None
         science_packs.append(
             ResearchSciencePack(
@@ -379,8 +467,8 @@ def extract_science_cost(scope: ResearchScope) -> Optional[ResearchScienceCost]:
 
     unit_count = None
     unit_count_text = None
-    for big_node in cell.find_all("big"):
-        candidate = big_node.get_text(" ", strip=True)
+    for big_node in cell.iterdescendants("big"):
+        candidate = node_text(big_node)
         if candidate:
             unit_count_text = candidate
             unit_count = parse_int(candidate)
@@ -395,12 +483,12 @@ def extract_science_cost(scope: ResearchScope) -> Optional[ResearchScienceCost]:
     )
 
 
-def extract_condition_text(scope: ResearchScope) -> Optional[str]:
+def extract_condition_text(labels: LabelIndex) -> Optional[str]:
     """
     Extract a textual research condition from the Researched by section.
 
     Args:
-        scope: HTML scope to search.
+        labels: Infobox label index for the page.
 
     Returns:
         Condition text with icon titles substituted.
@@ -408,42 +496,53 @@ def extract_condition_text(scope: ResearchScope) -> Optional[str]:
     Raises:
         None
     """
-    cell = find_section_cell_by_label(scope, "Researched by")
+    cell = labels.get("Researched by")
     if cell is None:
         return None
 
     parts: List[str] = []
+    # Depth-first over elements and pending tail strings. Children are pushed
+    # in reverse, each after its tail, so everything pops in document order.
+    # Like node_text, comments and script, style and template contents are
+    # not rendered text and are left out; their tails are kept.
+    stack: List[Union[HtmlElement, str]] = [cell]
+
+    while stack:
+        node = stack.pop()
+        if isinstance(node, str):
+            parts.append(node)
+            continue
 
-    def walk(node: Tag | NavigableString) -> None:
-        if isinstance(node, NavigableString):
-            parts.append(str(node))
-            return
-
-        if not isinstance(node, Tag):
-            return
-
-        if "factorio-icon" in (node.get("class") or []):
-            title = extract_icon_title(node)
+        if has_class(node, "factorio-icon"):
+            title, _ = extract_icon_info(node)
             if title:
                 parts.append(f" {title} ")
-            return
+            continue
 
-        for child in node.children:
-            walk(child)
+        if node.tag in NON_TEXT_TAGS:
+            continue
+
+        if node.text:
+            parts.append(node.text)
+
+        for child in reversed(node):
+            if child.tail:
+                stack.append(child.tail)
+            if isinstance(child.tag, str):
+                stack.append(child)
 
-    walk(cell)
     text = "".join(parts)
-    text = re.sub(r"\\s+", " ", text).strip()
+    text = WHITESPACE_RE.sub(" ", text).strip()
     return text or None
 
 
-def resolve_selected_variant(scope: ResearchScope, soup: BeautifulSoup) -> str:
+def resolve_selected_variant(scope: ResearchScope, root: HtmlElement) -> str:
     """
     Identify which research variant was selected from the page.
 
     Args:
         scope: HTML scope that was parsed.
-        soup: Full page soup for comparison.
+        root: Full page document for comparison.
 
     Returns:
         Variant label string.
@@ -451,47 +550,52 @@ def resolve_selected_variant(scope: ResearchScope, soup: BeautifulSoup) -> str:
     Raises:
         None
     """
-    if scope is soup:
+    if scope is root:
         return "single"
 
-    classes = scope.get("class") or []
-    if "tab-2" in classes:
+    if has_class(scope, "tab-2"):
         return "space-age"
-    if "tab-1" in classes:
+    if has_class(scope, "tab-1"):
         return "base-game"
     return "unknown"
 
 
-def parse_research_page(html: str, page_url: str) -> RawResearchRecord:
+def parse_research_page(html: bytes, page_url: str) -> RawResearchRecord:
     """
     Parse a research page into a structured record.
 
     Args:
-        html: HTML content for the page.
-        page_url: Page URL used for resolving links.
+        html: Raw UTF-8 HTML bytes for the page.
+        page_url: Page URL, already passed through normalize_research_url;
+            it is stored on the record unchanged.
 
     Returns:
         Parsed research record.
 
     Raises:
-        ValueError: If the page URL is empty.
+        ValueError: If the page URL is empty or the HTML cannot be parsed.
     """
     if not page_url:
         raise ValueError("Page URL must not be empty.")
 
-    soup = BeautifulSoup(html, "html.parser")
-    scope = get_preferred_research_scope(soup)
+    try:
+        root = lxml.html.document_fromstring(html, parser=HTML_PARSER)
+    except etree.ParserError as exc:
+        raise ValueError(f"Failed to parse HTML for {page_url}: {exc}") from exc
+
+    scope = get_preferred_research_scope(root)
+    labels = build_label_index(scope)
 
-    title = extract_page_title(soup)
-    internal_name = extract_internal_name(scope) or fallback_name_from_title(title, page_url)
+    title = extract_page_title(root)
+    internal_name = extract_internal_name(labels) or fallback_name_from_title(title, page_url)
 
-    allows_links = extract_allows_links(scope)
-    required_links = extract_required_links(scope)
+    allows_links = extract_allows_links(labels)
+    required_links = extract_required_links(labels)
 
-    is_space_age = extract_space_age_flag(soup)
-    selected_variant = resolve_selected_variant(scope, soup)
-    science_cost = extract_science_cost(scope)
-    condition_text = extract_condition_text(scope)
+    is_space_age = extract_space_age_flag(root, html)
+    selected_variant = resolve_selected_variant(scope, root)
+    science_cost = extract_science_cost(labels)
+    condition_text = extract_condition_text(labels)
     research_type = None
     research_science = None
     research_condition_text = None
@@ -507,7 +611,7 @@ def parse_research_page(html: str, page_url: str) -> RawResearchRecord:
         id=internal_name,
         title=title,
         internal_name=internal_name,
-        url=normalize_research_url(page_url),
+        url=page_url,
         allows_links_raw=allows_links,
         required_links_raw=required_links,
         is_space_age_exclusive=is_space_age,
@@ -3,12 +3,28 @@
 from __future__ import annotations
 
 import re
+from functools import lru_cache
 from typing import Optional
 from urllib.parse import unquote, urljoin, urlparse
 
 from config import BASE_URL
 
+# Most research pages are linked from several others, so the same URLs and
+# titles are normalized over and over during a crawl.
+NAME_CACHE_SIZE = 4096
 
+# Runs of unsafe characters and runs of whitespace each become one "_"; as
+# separate alternatives, an adjacent pair still yields "__" as before.
+UNSAFE_FILENAME_RE = re.compile(r"[\\/:*?\"<>|]+|\s+")
+RESEARCH_SUFFIX_RE = re.compile(r"\s*\(research\)\s*$", re.IGNORECASE)
+NON_ALNUM_RE = re.compile(r"[^a-z0-9]+")
+# A site-relative path with no query, fragment, params, control characters or
+# dot segments; urljoin and urlparse leave such a path untouched, whether it
+# is given alone or after BASE_URL.
+PLAIN_SITE_PATH_RE = re.compile(r"/(?![/.])(?:[^?#;/\x00-\x1f]|/(?!\.))*")
+
+
+@lru_cache(maxsize=NAME_CACHE_SIZE)
 def normalize_research_url(url: str) -> str:
     """
     Normalize a research URL to a stable absolute form.
@@ -25,6 +41,14 @@ def normalize_research_url(url: str) -> str:
     if not url:
         raise ValueError("URL must not be empty.")
 
+    # Wiki links are site-relative paths; BASE_URL is a bare origin, so these
+    # can be joined by concatenation without the urljoin/urlparse round trip.
+    if PLAIN_SITE_PATH_RE.fullmatch(url):
+        return BASE_URL + url.replace(" ", "_")
+    # Absolute wiki URLs, such as the configured roots, only need spaces fixed.
+    if url.startswith(BASE_URL) and PLAIN_SITE_PATH_RE.fullmatch(url, len(BASE_URL)):
+        return url.replace(" ", "_")
+
     if not url.startswith("http://") and not url.startswith("https://"):
         url = urljoin(BASE_URL, url)
 
@@ -47,11 +71,11 @@ def sanitize_filename(name: str) -> str:
         None
     """
     name = name.strip()
-    name = re.sub(r"[\\/:*?\"<>|]+", "_", name)
-    name = re.sub(r"\s+", "_", name)
+    name = UNSAFE_FILENAME_RE.sub("_", name)
     return name
 
 
+@lru_cache(maxsize=NAME_CACHE_SIZE)
 def slug_from_url(url: str) -> str:
     """
     Build a stable slug based on the final URL path segment.
@@ -71,6 +95,7 @@ def slug_from_url(url: str) -> str:
     return sanitize_filename(name)
 
 
+@lru_cache(maxsize=NAME_CACHE_SIZE)
 def fallback_name_from_title(title: Optional[str], url: str) -> str:
     """
     Derive a stable internal name when none is present in the page.
@@ -86,10 +111,11 @@ def fallback_name_from_title(title: Optional[str], url: str) -> str:
         None
     """
     if title:
-        cleaned = re.sub(r"\s*\(research\)\s*$", "", title, flags=re.IGNORECASE)
+        cleaned = RESEARCH_SUFFIX_RE.sub("", title)
         cleaned = cleaned.strip().lower()
-        cleaned = re.sub(r"[^a-z0-9]+", "_", cleaned)
-        cleaned = re.sub(r"_+", "_", cleaned).strip("_")
+        # "_" is itself outside [a-z0-9], so each maximal run, underscores
+        # included, collapses to a single "_" in this one pass.
+        cleaned = NON_ALNUM_RE.sub("_", cleaned).strip("_")
         if cleaned:
             return cleaned
 